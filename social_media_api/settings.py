@@ -15,6 +15,7 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
+import orjson
 
 load_dotenv()
 
@@ -96,9 +97,26 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST"),
         "PORT": os.environ.get("POSTGRES_PORT"),
+        # Keep connections open between requests instead of reconnecting
+        # to Postgres on every request. Set to 0 when running behind a
+        # transaction-pooling PgBouncer.
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# With POSTGRES_POOL_MAX_SIZE set, every worker process keeps a psycopg
+# connection pool instead of a single persistent connection. Django requires
+# CONN_MAX_AGE to be 0 when pooling.
+if os.getenv("POSTGRES_POOL_MAX_SIZE"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE")),
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -135,7 +153,9 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 MEDIA_ROOT = BASE_DIR / "files/media"
-MEDIA_URL = "/media/"
+# Point MEDIA_URL at a CDN (e.g. https://cdn.example.com/media/) to have
+# uploaded images served from it instead of through Django.
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
 
 STATIC_URL = "static/"
 
@@ -148,12 +168,18 @@ AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "social_network.authentication.ProfileJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # Errors for list items are keyed by their integer index.
+    "ORJSON_RENDERER_OPTIONS": (orjson.OPT_NON_STR_KEYS,),
 }
 
 SIMPLE_JWT = {
@@ -179,6 +205,22 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Serialized list responses are cached in Redis when REDIS_CACHE_URL is set;
+# without it caching is disabled.
+if os.getenv("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+    }
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_TIMEZONE = "Europe/Prague"
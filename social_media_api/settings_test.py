@@ -0,0 +1,22 @@
+"""
+Django settings for running the test suite.
+
+`manage.py test` picks this module up unless DJANGO_SETTINGS_MODULE is set.
+"""
+
+from social_media_api.settings import *  # noqa: F401,F403
+
+# Tests never check password strength, so skip the slow PBKDF2 rounds.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+# A stable name lets `manage.py test --keepdb` reuse the schema between runs.
+DATABASES["default"]["TEST"] = {  # noqa: F405
+    "NAME": "test_social_media_api",
+}
+
+# Fail any request that lazily loads the same relation for several rows.
+INSTALLED_APPS += ["zeal"]  # noqa: F405
+MIDDLEWARE += ["zeal.middleware.zeal_middleware"]  # noqa: F405
+ZEAL_RAISE = True
@@ -6,4 +6,5 @@ class SocialNetworkConfig(AppConfig):
     name = "social_network"
 
     def ready(self):
+        import social_network.lookups
         import social_network.signals
@@ -0,0 +1,34 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class _ProfileUserModel:
+    """
+    Stands in for the user model in `JWTAuthentication.get_user`, so the
+    lookup joins the profile while the token checks stay simplejwt's own.
+    Anything but `objects` is read from the real model.
+    """
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self.objects = model.objects.select_related("profile")
+
+    def __getattr__(self, name: str):
+        return getattr(self.model, name)
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user together with their profile,
+    so views reading `request.user.profile` do not issue a second query.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.user_model = _ProfileUserModel(self.user_model)
+
+
+class ProfileJWTAuthenticationScheme(SimpleJWTScheme):
+    """Documents ProfileJWTAuthentication as the regular JWT scheme."""
+
+    target_class = "social_network.authentication.ProfileJWTAuthentication"
@@ -0,0 +1,79 @@
+import hashlib
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+LIST_CACHE_TIMEOUT = 60
+HASHTAG_CACHE_TIMEOUT = 300
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def get_list_version(namespace: str) -> int:
+    return cache.get_or_set(_version_key(namespace), 1, timeout=None)
+
+
+def bump_list_version(namespace: str) -> None:
+    """
+    Invalidates every cached list in the namespace at once by moving it to
+    a new version; stale entries are never read again and simply expire.
+    """
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), 1, timeout=None)
+
+
+def bump_list_version_on_commit(namespace: str) -> None:
+    transaction.on_commit(partial(bump_list_version, namespace))
+
+
+def list_cache_key(
+    namespace: str, action: str, viewer_id: int, query_params
+) -> str:
+    query = "&".join(
+        f"{name}={value}"
+        for name, value in sorted(query_params.items())
+    )
+    query_hash = hashlib.md5(query.encode()).hexdigest()
+    return (
+        f"{namespace}:{get_list_version(namespace)}:"
+        f"{action}:{viewer_id}:{query_hash}"
+    )
+
+
+def _hashtag_key(caption: str) -> str:
+    return f"hashtag:{hashlib.md5(caption.encode()).hexdigest()}"
+
+
+def get_hashtag_ids(captions) -> dict[str, int]:
+    cached = cache.get_many([_hashtag_key(caption) for caption in captions])
+    return {
+        caption: cached[_hashtag_key(caption)]
+        for caption in captions
+        if _hashtag_key(caption) in cached
+    }
+
+
+def set_hashtag_ids_on_commit(hashtag_ids: dict[str, int]) -> None:
+    """
+    Remembers caption ids once the transaction that may have created them
+    is committed, so a rolled back insert is never cached.
+    """
+    transaction.on_commit(
+        lambda: cache.set_many(
+            {
+                _hashtag_key(caption): hashtag_id
+                for caption, hashtag_id in hashtag_ids.items()
+            },
+            HASHTAG_CACHE_TIMEOUT,
+        )
+    )
+
+
+def delete_hashtag_id(caption: str) -> None:
+    cache.delete(_hashtag_key(caption))
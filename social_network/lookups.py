@@ -0,0 +1,18 @@
+from django.db.models import Field, Lookup
+
+
+@Field.register_lookup
+class AnyLookup(Lookup):
+    """
+    `field__any=[...]` renders `field = ANY(%s)` and binds the whole list
+    as one array parameter, so the SQL text stays the same whatever the
+    number of values, unlike `IN (%s, %s, ...)`.
+    """
+
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} = ANY({rhs})", [*lhs_params, *rhs_params]
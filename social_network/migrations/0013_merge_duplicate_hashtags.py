@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_hashtags(apps, schema_editor):
+    """
+    Keep the oldest HashTag for every caption, move post links of the
+    duplicates onto it and delete the duplicates, so that caption can be
+    made unique.
+    """
+    HashTag = apps.get_model("social_network", "HashTag")
+    PostHashTags = apps.get_model("social_network", "Post").hashtags.through
+
+    duplicates = (
+        HashTag.objects.values("caption")
+        .annotate(keep_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        keep_id = duplicate["keep_id"]
+        extra_ids = list(
+            HashTag.objects.filter(caption=duplicate["caption"])
+            .exclude(id=keep_id)
+            .values_list("id", flat=True)
+        )
+        tagged_posts = PostHashTags.objects.filter(
+            hashtag_id=keep_id
+        ).values("post_id")
+        for hashtag_id in extra_ids:
+            PostHashTags.objects.filter(hashtag_id=hashtag_id).exclude(
+                post_id__in=tagged_posts
+            ).update(hashtag_id=keep_id)
+        HashTag.objects.filter(id__in=extra_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0012_add_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_hashtags, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0013_merge_duplicate_hashtags"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hashtag",
+            name="caption",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+    ]
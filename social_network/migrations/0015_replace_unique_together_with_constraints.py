@@ -0,0 +1,42 @@
+# Generated by Django 4.2.9 on 2026-10-15 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0014_alter_hashtag_caption_unique"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="followinginteraction",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="like",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="followinginteraction",
+            constraint=models.UniqueConstraint(
+                fields=("follower", "followee"), name="uniq_follow_follower_followee"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="followinginteraction",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("follower", models.F("followee")), _negated=True
+                ),
+                name="no_self_follow",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="like",
+            constraint=models.UniqueConstraint(
+                fields=("post", "profile"), name="uniq_like_post_profile"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0015_replace_unique_together_with_constraints"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                fields=["first_name", "last_name"], name="profile_full_name_idx"
+            ),
+        ),
+    ]
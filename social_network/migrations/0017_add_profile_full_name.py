@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-15 22:08
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0016_add_profile_ordering_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="full_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Concat(
+                    "first_name", models.Value(" "), "last_name"
+                ),
+                output_field=models.CharField(max_length=511),
+            ),
+        ),
+    ]
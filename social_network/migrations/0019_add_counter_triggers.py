@@ -0,0 +1,107 @@
+from django.db import migrations
+
+
+CREATE_TRIGGERS = """
+CREATE FUNCTION social_network_like_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE social_network_post SET likes_count = likes_count + 1
+        WHERE id = NEW.post_id;
+    ELSE
+        UPDATE social_network_post SET likes_count = likes_count - 1
+        WHERE id = OLD.post_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER social_network_like_counter
+AFTER INSERT OR DELETE ON social_network_like
+FOR EACH ROW EXECUTE FUNCTION social_network_like_counter();
+
+CREATE FUNCTION social_network_comment_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE social_network_post SET comments_count = comments_count + 1
+        WHERE id = NEW.post_id;
+    ELSE
+        UPDATE social_network_post SET comments_count = comments_count - 1
+        WHERE id = OLD.post_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER social_network_comment_counter
+AFTER INSERT OR DELETE ON social_network_comment
+FOR EACH ROW EXECUTE FUNCTION social_network_comment_counter();
+
+CREATE FUNCTION social_network_follow_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE social_network_profile
+        SET followees_total = followees_total + 1
+        WHERE id = NEW.follower_id;
+        UPDATE social_network_profile
+        SET followers_total = followers_total + 1
+        WHERE id = NEW.followee_id;
+    ELSE
+        UPDATE social_network_profile
+        SET followees_total = followees_total - 1
+        WHERE id = OLD.follower_id;
+        UPDATE social_network_profile
+        SET followers_total = followers_total - 1
+        WHERE id = OLD.followee_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER social_network_follow_counter
+AFTER INSERT OR DELETE ON social_network_followinginteraction
+FOR EACH ROW EXECUTE FUNCTION social_network_follow_counter();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER social_network_follow_counter
+ON social_network_followinginteraction;
+DROP FUNCTION social_network_follow_counter();
+DROP TRIGGER social_network_comment_counter ON social_network_comment;
+DROP FUNCTION social_network_comment_counter();
+DROP TRIGGER social_network_like_counter ON social_network_like;
+DROP FUNCTION social_network_like_counter();
+"""
+
+BACKFILL_COUNTERS = """
+UPDATE social_network_post AS post SET
+    likes_count = (
+        SELECT COUNT(*) FROM social_network_like
+        WHERE post_id = post.id
+    ),
+    comments_count = (
+        SELECT COUNT(*) FROM social_network_comment
+        WHERE post_id = post.id
+    );
+
+UPDATE social_network_profile AS profile SET
+    followers_total = (
+        SELECT COUNT(*) FROM social_network_followinginteraction
+        WHERE followee_id = profile.id
+    ),
+    followees_total = (
+        SELECT COUNT(*) FROM social_network_followinginteraction
+        WHERE follower_id = profile.id
+    );
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0018_add_counter_columns"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL_COUNTERS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-15 22:25
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_network", "0019_add_counter_triggers"),
+    ]
+
+    operations = [
+        # Build the new index first so the feed query always has one.
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at"],
+                include=("title",),
+                name="post_feed_covering_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_author_created_at_idx",
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-15 22:54
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0020_add_post_feed_covering_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="first_name_lower",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower("first_name"),
+                output_field=models.CharField(max_length=255),
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="last_name_lower",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower("last_name"),
+                output_field=models.CharField(max_length=255),
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="username_lower",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower("username"),
+                output_field=models.CharField(max_length=100),
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+TRIGRAM_INDEXES = {
+    "profile_username_trgm_idx": "username_lower",
+    "profile_first_name_trgm_idx": "first_name_lower",
+    "profile_last_name_trgm_idx": "last_name_lower",
+}
+
+
+def create_trigram_indexes(apps, schema_editor) -> None:
+    """
+    pg_trgm is a contrib extension that not every Postgres install ships.
+    Without it the search columns still work, only without an index.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON social_network_profile "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor) -> None:
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0021_add_profile_search_columns"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def lowercase_captions(apps, schema_editor) -> None:
+    """
+    Lower-cases the stored captions. Hashtags differing only in case are
+    merged into the oldest one, keeping every post they were attached to.
+    """
+    HashTag = apps.get_model("social_network", "HashTag")
+    PostHashTag = apps.get_model("social_network", "Post").hashtags.through
+
+    kept = {}
+    for hashtag in HashTag.objects.order_by("id").iterator():
+        keeper = kept.setdefault(hashtag.caption.lower(), hashtag)
+        if keeper is hashtag:
+            continue
+        PostHashTag.objects.filter(hashtag_id=hashtag.id).exclude(
+            post_id__in=PostHashTag.objects.filter(
+                hashtag_id=keeper.id
+            ).values("post_id")
+        ).update(hashtag_id=keeper.id)
+        hashtag.delete()
+
+    for caption, hashtag in kept.items():
+        if hashtag.caption != caption:
+            HashTag.objects.filter(id=hashtag.id).update(caption=caption)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0022_add_profile_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_captions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-15 23:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_network", "0023_lowercase_hashtag_captions"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="hashtag",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("caption", django.db.models.functions.text.Lower("caption"))
+                ),
+                name="hashtag_caption_lower_case",
+            ),
+        ),
+    ]
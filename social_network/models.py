@@ -1,10 +1,34 @@
 from django.conf import settings
-from django.db import models
+from django.db import connections, models
+from django.db.models.functions import Concat, Lower
 
+from social_network.cache import get_hashtag_ids, set_hashtag_ids_on_commit
 from social_network.upload_to_path import UploadToPath
 
 
-class Profile(models.Model):
+class TriggerCountersMixin:
+    """
+    Counter columns listed in `counter_fields` are kept up to date by
+    database triggers, so saving an existing instance must not write back
+    the possibly stale values it was loaded with.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = set(self.counter_fields) | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
+
+class Profile(TriggerCountersMixin, models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
@@ -17,19 +41,102 @@ class Profile(models.Model):
     profile_image = models.ImageField(
         upload_to=UploadToPath("profile_images/"), blank=True, null=True
     )
+    full_name = models.GeneratedField(
+        expression=Concat("first_name", models.Value(" "), "last_name"),
+        output_field=models.CharField(max_length=511),
+        db_persist=True,
+    )
+    # Lower-cased copies of the searchable names. The profile search
+    # filters on them with LIKE, which a trigram index can serve.
+    username_lower = models.GeneratedField(
+        expression=Lower("username"),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+    )
+    first_name_lower = models.GeneratedField(
+        expression=Lower("first_name"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+    )
+    last_name_lower = models.GeneratedField(
+        expression=Lower("last_name"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+    )
+    followers_total = models.PositiveIntegerField(default=0, editable=False)
+    followees_total = models.PositiveIntegerField(default=0, editable=False)
 
-    @property
-    def full_name(self):
-        return f"{self.first_name} {self.last_name}"
+    counter_fields = ("followers_total", "followees_total")
 
     class Meta:
         ordering = ["first_name", "last_name"]
         verbose_name_plural = "profiles"
+        indexes = [
+            models.Index(
+                fields=["first_name", "last_name"],
+                name="profile_full_name_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.username})"
 
 
+class InsertIgnoringConflictsMixin:
+    """
+    Lets a manager add a single row with INSERT ... ON CONFLICT DO NOTHING,
+    so a duplicate is reported without a savepoint or a prior SELECT.
+    """
+
+    def insert_ignoring_conflicts(self, **values) -> bool:
+        """
+        Insert a row built from `values` unless it violates a unique
+        constraint and return whether it was inserted. Like bulk_create(),
+        this sends no model signals.
+        """
+        connection = connections[self.db]
+        instance = self.model(**values)
+        fields = [
+            field
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key and not field.generated
+        ]
+        columns = ", ".join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        placeholders = ", ".join(["%s"] * len(fields))
+        params = [
+            field.get_db_prep_save(
+                field.pre_save(instance, add=True), connection
+            )
+            for field in fields
+        ]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+                "ON CONFLICT DO NOTHING",
+                params,
+            )
+            return cursor.rowcount == 1
+
+
+class FollowingInteractionManager(
+    InsertIgnoringConflictsMixin, models.Manager
+):
+    """Define a model manager for FollowingInteraction model."""
+
+    def with_profile(self, side: str) -> models.QuerySet:
+        """
+        Annotate each interaction with `profile_id` and `username` of its
+        `side` ("follower" or "followee") without loading that profile.
+        """
+        return self.annotate(
+            profile_id=models.F(f"{side}_id"),
+            username=models.F(f"{side}__username"),
+        ).only("id", "follower", "followee")
+
+
 class FollowingInteraction(models.Model):
     follower = models.ForeignKey(
         Profile,
@@ -43,21 +150,79 @@ class FollowingInteraction(models.Model):
     )
     followed_at = models.DateTimeField(auto_now_add=True)
 
+    objects = FollowingInteractionManager()
+
     class Meta:
-        unique_together = ["follower", "followee"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"],
+                name="uniq_follow_follower_followee",
+            ),
+            models.CheckConstraint(
+                condition=~models.Q(follower=models.F("followee")),
+                name="no_self_follow",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.follower} follows {self.followee}"
     
 
+class HashTagManager(models.Manager):
+    """Define a model manager for HashTag model with batched creation."""
+
+    def get_or_create_many(self, captions) -> list["HashTag"]:
+        """
+        Return HashTag objects for the given captions, creating the missing
+        ones with a single bulk insert instead of one query per caption.
+        Ids of recently used captions are served from the cache.
+
+        Captions are stored lower-cased, so filtering by hashtag is a plain
+        equality lookup on the unique index.
+        """
+        captions = {caption.lower() for caption in captions}
+        if not captions:
+            return []
+
+        hashtags = [
+            self.model(id=hashtag_id, caption=caption)
+            for caption, hashtag_id in get_hashtag_ids(captions).items()
+        ]
+        missing = captions - {hashtag.caption for hashtag in hashtags}
+        if missing:
+            loaded = list(self.filter(caption__any=list(missing)))
+            missing -= {hashtag.caption for hashtag in loaded}
+            if missing:
+                self.bulk_create(
+                    [self.model(caption=caption) for caption in missing],
+                    ignore_conflicts=True,
+                )
+                loaded.extend(self.filter(caption__any=list(missing)))
+            set_hashtag_ids_on_commit(
+                {hashtag.caption: hashtag.id for hashtag in loaded}
+            )
+            hashtags.extend(loaded)
+        return hashtags
+
+
 class HashTag(models.Model):
-    caption = models.CharField(max_length=50)
+    caption = models.CharField(max_length=50, unique=True)
+
+    objects = HashTagManager()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(caption=Lower("caption")),
+                name="hashtag_caption_lower_case",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.caption}"
 
 
-class Post(models.Model):
+class Post(TriggerCountersMixin, models.Model):
     title = models.CharField(max_length=80)
     content = models.TextField()
     image = models.ImageField(
@@ -77,14 +242,30 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     scheduled_at = models.DateTimeField(blank=True, null=True, default=None)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("likes_count", "comments_count")
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="post_created_at_idx"),
+            models.Index(
+                fields=["author", "-created_at"],
+                include=["title"],
+                name="post_feed_covering_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Post by {self.author} at {self.created_at}"
 
 
+class LikeManager(InsertIgnoringConflictsMixin, models.Manager):
+    """Define a model manager for Like model."""
+
+
 class Like(models.Model):
     post = models.ForeignKey(
         Post,
@@ -98,8 +279,21 @@ class Like(models.Model):
     )
     liked_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LikeManager()
+
     class Meta:
-        unique_together = ["post", "profile"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "profile"],
+                name="uniq_like_post_profile",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["profile", "-liked_at"],
+                name="like_profile_liked_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.profile} liked {self.post} at {self.liked_at}"
@@ -121,6 +315,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["commented_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "commented_at"],
+                name="comment_post_commented_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.author} commented on {self.post} at {self.commented_at}"
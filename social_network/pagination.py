@@ -0,0 +1,20 @@
+from rest_framework.pagination import CursorPagination
+
+
+# How many likes and comments are embedded in the post detail response.
+EMBEDDED_PAGE_SIZE = 20
+
+
+class CommentCursorPagination(CursorPagination):
+    page_size = 50
+    ordering = "commented_at"
+
+
+class LikeCursorPagination(CursorPagination):
+    page_size = 50
+    ordering = "-liked_at"
+
+
+class PostCursorPagination(CursorPagination):
+    page_size = 50
+    ordering = "-created_at"
@@ -9,10 +9,10 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
 
         Allows read-only access for safe methods. For authenticated users, 
         checks if the user is the owner of the object. Ownership is validated 
-        differently based on the view class:
+        by comparing primary keys, so the related rows are never loaded:
     
-        - For ProfileViewSet, verifies if the profile associated with
-        the object matches the requesting user's profile.
+        - For views that set ``owned_by_user = True`` (ProfileViewSet),
+        verifies that the object belongs to the requesting user.
         - For other viewsets, compares the object's author with the requesting 
         user's profile.
 
@@ -25,7 +25,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         if request.user and request.user.is_authenticated:
-            if view.__class__.__name__ == "ProfileViewSet":
-                return obj.user.profile == request.user.profile
-            return obj.author == request.user.profile
+            if getattr(view, "owned_by_user", False):
+                return obj.user_id == request.user.pk
+            return obj.author_id == request.user.profile.pk
         return False
@@ -1,9 +1,11 @@
+import copy
+
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema_field
-
 from social_network.models import (
     Comment,
     HashTag,
@@ -12,9 +14,25 @@ from social_network.models import (
     Post,
     Like,
 )
+from social_network.pagination import EMBEDDED_PAGE_SIZE
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that builds its fields from the model once per class
+    and hands every instance a fresh copy of them.
+    """
+
+    _fields_cache: dict[type, dict] = {}
 
+    def get_fields(self) -> dict:
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return copy.deepcopy(self._fields_cache[cls])
 
-class ProfileSerializer(serializers.ModelSerializer):
+
+class ProfileSerializer(CachedFieldsModelSerializer):
     user_email = serializers.EmailField(source="user.email", read_only=True)
 
     class Meta:
@@ -33,18 +51,23 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         """"
-        If no new profile image in the request, keep the existing one.
+        If no new profile image in the request, keep the existing one
+        untouched instead of assigning it back to the instance.
+        Only the columns present in the request are written.
         """
         if not validated_data.get("profile_image"):
-            validated_data["profile_image"] = instance.profile_image
-        return super().update(instance, validated_data)
+            validated_data.pop("profile_image", None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
 
 
 class ProfileListSerializer(ProfileSerializer):
-    followed_by_me = serializers.SerializerMethodField()
+    followed_by_me = serializers.BooleanField(read_only=True)
     followers_total = serializers.IntegerField(read_only=True)
     followees_total = serializers.IntegerField(read_only=True)
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(read_only=True)
 
     class Meta:
         model = Profile
@@ -58,29 +81,16 @@ class ProfileListSerializer(ProfileSerializer):
             "followees_total",
         )
 
-    def get_followed_by_me(self, obj: Profile) -> bool:
-        request = self.context.get("request", None)
-        if request is not None and request.user.is_authenticated:
-            return obj.followed_by_me
-        return False
-    
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_full_name(self, obj: Profile) -> str:
-        return obj.full_name
 
+class FollowingProfileSerializer(CachedFieldsModelSerializer):
+    """
+    The profile on one side of a FollowingInteraction, read from the
+    `profile_id` and `username` annotations of
+    FollowingInteraction.objects.with_profile().
+    """
 
-class FollowerSerializer(serializers.ModelSerializer):
-    profile_id = serializers.IntegerField(source="follower.id", read_only=True)
-    username = serializers.CharField(source="follower.username")
-
-    class Meta:
-        model = FollowingInteraction
-        fields = ("profile_id", "username")
-
-
-class FolloweeSerializer(serializers.ModelSerializer):
-    profile_id = serializers.IntegerField(source="followee.id", read_only=True)
-    username = serializers.CharField(source="followee.username")
+    profile_id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
 
     class Meta:
         model = FollowingInteraction
@@ -88,8 +98,16 @@ class FolloweeSerializer(serializers.ModelSerializer):
 
 
 class ProfileDetailSerializer(ProfileSerializer):
-    followers = FollowerSerializer(many=True, read_only=True)
-    followees = FolloweeSerializer(many=True, read_only=True)
+    followers = FollowingProfileSerializer(
+        source="prefetched_followers",
+        many=True,
+        read_only=True
+    )
+    followees = FollowingProfileSerializer(
+        source="prefetched_followees",
+        many=True,
+        read_only=True
+    )
 
     class Meta:
         model = Profile
@@ -111,7 +129,23 @@ class EmptySerializer(serializers.Serializer):
     pass
 
 
-class PostSerializer(serializers.ModelSerializer):
+class HashTagCaptionsField(serializers.ListField):
+    """
+    Renders the captions of a post's hashtags, reading them from the
+    `prefetched_hashtags` list when the view has prefetched it.
+    """
+
+    child = serializers.CharField()
+
+    def get_attribute(self, instance):
+        prefetched = getattr(instance, "prefetched_hashtags", None)
+        if prefetched is not None:
+            return [hashtag.caption for hashtag in prefetched]
+        hashtags = super().get_attribute(instance)
+        return list(hashtags.values_list("caption", flat=True))
+
+
+class PostSerializer(CachedFieldsModelSerializer):
     author_username = serializers.CharField(
         source="author.username",
         read_only=True
@@ -130,11 +164,7 @@ class PostSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
-    hashtags_objects = serializers.StringRelatedField(
-        source="hashtags",
-        many=True,
-        read_only=True
-    )
+    hashtags_objects = HashTagCaptionsField(source="hashtags", read_only=True)
     scheduled_at = serializers.DateTimeField(required=False, write_only=True)
 
     class Meta:
@@ -161,14 +191,16 @@ class PostSerializer(serializers.ModelSerializer):
         hashtags_data = validated_data.pop("hashtags", [])
         post = Post.objects.create(**validated_data)
 
-        for caption in hashtags_data:
-            hashtag, created = HashTag.objects.get_or_create(caption=caption)
-            post.hashtags.add(hashtag)
+        hashtags = HashTag.objects.get_or_create_many(hashtags_data)
+        if hashtags:
+            post.hashtags.add(*hashtags)
+        # The response lists the captions, which are already loaded here.
+        post.prefetched_hashtags = hashtags
         return post
 
 
 class PostListSerializer(PostSerializer):
-    liked_by_user = serializers.SerializerMethodField()
+    liked_by_user = serializers.BooleanField(read_only=True)
     likes_count = serializers.IntegerField(read_only=True)
     comments_count = serializers.IntegerField(read_only=True)
 
@@ -186,20 +218,22 @@ class PostListSerializer(PostSerializer):
             "scheduled_at",
         )
 
-    def get_liked_by_user(self, obj: Post) -> bool:
-        request = self.context.get("request", None)
-        if request is not None and request.user.is_authenticated:
-            return obj.liked_by_user
-        return False
+
+class BulkLikeSerializer(serializers.Serializer):
+    post_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
 
 
-class PostImageSerializer(serializers.ModelSerializer):
+class PostImageSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Post
         fields = ("id","image",)
 
 
-class LikeSerializer(serializers.ModelSerializer):
+class LikeSerializer(CachedFieldsModelSerializer):
     liked_by = serializers.StringRelatedField(
         source="profile.username",
         read_only=True
@@ -210,12 +244,24 @@ class LikeSerializer(serializers.ModelSerializer):
         fields = ("id", "liked_by")
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class JSONDateTimeField(serializers.DateTimeField):
+    """
+    DateTimeField that also renders the ISO strings datetimes become
+    inside JSON built by the database.
+    """
+
+    def to_representation(self, value):
+        if isinstance(value, str):
+            value = parse_datetime(value)
+        return super().to_representation(value)
+
+
+class CommentSerializer(CachedFieldsModelSerializer):
     author_username = serializers.CharField(
         source="author.username",
         read_only=True
     )
-    commented_at = serializers.DateTimeField(read_only=True)
+    commented_at = JSONDateTimeField(read_only=True)
 
     class Meta:
         model = Comment
@@ -228,8 +274,44 @@ class CommentSerializer(serializers.ModelSerializer):
 
 
 class PostDetailSerializer(PostSerializer):
-    likes = LikeSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    likes = LikeSerializer(source="likes_data", many=True, read_only=True)
+    comments = CommentSerializer(
+        source="comments_data",
+        many=True,
+        read_only=True
+    )
+
+    likes_url = serializers.SerializerMethodField()
+    comments_url = serializers.SerializerMethodField()
 
     class Meta(PostSerializer.Meta):
-        fields = PostSerializer.Meta.fields + ("likes", "comments")
+        fields = PostSerializer.Meta.fields + (
+            "likes",
+            "likes_url",
+            "comments",
+            "comments_url",
+        )
+
+    def _list_url(self, view_name: str, total: int, *args) -> str | None:
+        """
+        URL of the full paginated list when the post has more entries than
+        are embedded in the response. The list starts from the beginning,
+        so its first page repeats the embedded entries.
+        """
+        if total <= EMBEDDED_PAGE_SIZE:
+            return None
+        url = reverse(view_name, args=args)
+        request = self.context.get("request", None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_likes_url(self, obj: Post) -> str | None:
+        return self._list_url(
+            "social_network:posts-likes", obj.likes_count, obj.pk
+        )
+
+    def get_comments_url(self, obj: Post) -> str | None:
+        return self._list_url(
+            "social_network:post-comments-list", obj.comments_count, obj.pk
+        )
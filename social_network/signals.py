@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Profile
+
+from .cache import bump_list_version_on_commit, delete_hashtag_id
+from .models import (
+    Comment,
+    FollowingInteraction,
+    HashTag,
+    Like,
+    Post,
+    Profile,
+)
 
 
 User = get_user_model()
@@ -14,3 +23,26 @@ def create_user_profile(sender, instance, created, **kwargs) -> None:
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs) -> None:
     instance.profile.save()
+
+# Likes, comments and follows have no delete receivers, so Django can
+# delete them (and cascade to them) without loading the rows; the views
+# that delete them bump the list versions themselves.
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=FollowingInteraction)
+def invalidate_profile_lists(sender, **kwargs) -> None:
+    bump_list_version_on_commit("profiles")
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=FollowingInteraction)
+def invalidate_post_lists(sender, **kwargs) -> None:
+    bump_list_version_on_commit("posts")
+
+@receiver(post_delete, sender=HashTag)
+def forget_hashtag_id(sender, instance, **kwargs) -> None:
+    delete_hashtag_id(instance.caption)
@@ -1,6 +1,8 @@
 from celery import shared_task
 
-from social_network.models import HashTag, Post, Profile
+from django.db import transaction
+
+from social_network.models import HashTag, Post
 
 
 @shared_task
@@ -10,14 +12,9 @@ def create_scheduled_post(post_data: dict) -> None:
     when the task is executed.
     """
     post_data.pop("scheduled_at", None)
-    author_id = post_data.pop("author_id")
-    author = Profile.objects.get(pk=author_id)
     hashtag_captions = post_data.pop("hashtags", [])
-    post = Post.objects.create(author=author, **post_data)
-
-    hashtags = []
-    for caption in hashtag_captions:
-        hashtag, created = HashTag.objects.get_or_create(caption=caption)
-        hashtags.append(hashtag)
-
-    post.hashtags.set(hashtags)
+    with transaction.atomic():
+        post = Post.objects.create(**post_data)
+        post.hashtags.set(
+            HashTag.objects.get_or_create_many(hashtag_captions)
+        )
@@ -0,0 +1,38 @@
+import functools
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from social_network.models import Profile
+
+
+def bulk_create_users(*users_params) -> list:
+    """
+    Creates the users and their empty profiles with one INSERT each.
+    bulk_create sends no post_save, so the profiles that signal would add
+    one by one are created here instead.
+
+    The API tests authenticate with JWT, so users created without a
+    password get an unusable one and skip hashing altogether.
+    """
+    user_model = get_user_model()
+    users = user_model.objects.bulk_create(
+        user_model(
+            **{**params, "password": make_password(params.get("password"))}
+        )
+        for params in users_params
+    )
+    Profile.objects.bulk_create(Profile(user=user) for user in users)
+    return users
+
+
+@functools.lru_cache(maxsize=64)
+def bearer_for(user_id: int) -> str:
+    """
+    Returns an Authorization header for the user, signing the access token
+    only once per user for the whole test run.
+    """
+    user = get_user_model().objects.get(pk=user_id)
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
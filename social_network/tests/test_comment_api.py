@@ -1,43 +1,60 @@
 from django.urls import reverse
-from django.contrib.auth import get_user_model
 
 from rest_framework import status
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from social_network.models import Comment, Post
+from social_network.tests.helpers import bearer_for, bulk_create_users
 
 
 class CommentViewSetTests(APITestCase):
-    def setUp(self):
-        self.user = get_user_model().objects.create_user(
-            email="test@test.com",
-            password="testpassword",
-            first_name="John",
-            last_name="Doe",
-        )
-        self.token = RefreshToken.for_user(self.user)
-        self.client.credentials(
-            HTTP_AUTHORIZATION=f"Bearer {self.token.access_token}"
+    @classmethod
+    def setUpTestData(cls):
+        (cls.user,) = bulk_create_users(
+            {
+                "email": "test@test.com",
+                "first_name": "John",
+                "last_name": "Doe",
+            }
         )
-        self.post = Post.objects.create(
+        cls.post = Post.objects.create(
             title="Test Post",
             content="This is a test post.",
-            author=self.user.profile,
+            author=cls.user.profile,
         )
-        self.comment = Comment.objects.create(
-            author=self.user.profile,
-            post=self.post,
+        cls.comment = Comment.objects.create(
+            author=cls.user.profile,
+            post=cls.post,
             content="This is a test comment."
         )
+        cls.auth_header = bearer_for(cls.user.pk)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
 
     def test_list_comments_endpoint(self):
         url = reverse("social_network:post-comments-list", args=[self.post.pk])
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.comment.id)
-        self.assertEqual(response.data[0]["content"], self.comment.content)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.comment.id)
+        self.assertEqual(
+            response.data["results"][0]["content"],
+            self.comment.content
+        )
+
+    def test_list_comments_joins_authors(self):
+        Comment.objects.create(
+            author=self.user.profile,
+            post=self.post,
+            content="Another comment."
+        )
+        url = reverse("social_network:post-comments-list", args=[self.post.pk])
+        # The user with their profile and the comments with their authors.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_retrieve_comment_endpoint(self):
         url = reverse(
@@ -58,6 +75,23 @@ class CommentViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["content"], data["content"])
 
+    def test_create_comment_for_missing_post_returns_404(self):
+        url = reverse(
+            "social_network:post-comments-list",
+            args=[self.post.pk + 1000]
+        )
+        response = self.client.post(url, {"content": "Nobody reads this."})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_comments_endpoint(self):
+        url = reverse("social_network:post-comments-bulk", args=[self.post.pk])
+        data = [{"content": "First comment."}, {"content": "Second comment."}]
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[1]["content"], "Second comment.")
+        self.assertEqual(self.post.comments.count(), 3)
+
     def test_update_comment_endpoint(self):
         url = reverse(
             "social_network:post-comments-detail",
@@ -1,76 +1,176 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from unittest.mock import patch
 import zoneinfo
 
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from django.contrib.auth import get_user_model
 
 from rest_framework import status
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from social_network.models import FollowingInteraction, Post, HashTag, Like
+from social_network.models import (
+    Comment,
+    FollowingInteraction,
+    HashTag,
+    Like,
+    Post,
+)
+from social_network.tests.helpers import bearer_for, bulk_create_users
+from social_network.views import MAX_HASHTAG_FILTERS
+
+
+PRAGUE = zoneinfo.ZoneInfo("Europe/Prague")
+
+POSTS_LIST_URL = reverse("social_network:posts-list")
+MY_POSTS_URL = reverse("social_network:posts-my-posts")
+FOLLOWEES_POSTS_URL = reverse("social_network:posts-followees-posts")
+BULK_LIKE_URL = reverse("social_network:posts-bulk-like")
+LIKED_POSTS_URL = reverse("social_network:posts-liked")
 
 
 class PostViewSetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.user_2 = bulk_create_users(
+            {
+                "email": "test@test.com",
+                "first_name": "John",
+                "last_name": "Doe",
+            },
+            {
+                "email": "test2@test.com",
+                "first_name": "Jane",
+                "last_name": "Doe",
+            },
+        )
+        cls.post, cls.post_2 = Post.objects.bulk_create(
+            [
+                Post(
+                    title="Test Post",
+                    content="This is a test post.",
+                    author=cls.user.profile,
+                ),
+                Post(
+                    title="Test Post 2",
+                    content="This is a test post 2.",
+                    author=cls.user_2.profile,
+                ),
+            ]
+        )
+        cls.auth_header = bearer_for(cls.user.pk)
+
     def setUp(self):
-        self.user = get_user_model().objects.create_user(
-            email="test@test.com",
-            password="testpassword",
-            first_name="John",
-            last_name="Doe",
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
+
+    def test_get_list_posts_endpoint(self):
+        response = self.client.get(POSTS_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["id"], self.post_2.id)
+        self.assertEqual(results[0]["title"], self.post_2.title)
+        self.assertEqual(results[1]["id"], self.post.id)
+        self.assertEqual(results[1]["title"], self.post.title)
+
+    def test_get_list_posts_does_not_load_deferred_fields(self):
+        # The user with their profile, the post list and the hashtags
+        # prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(POSTS_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_get_list_posts_anonymous_has_not_liked(self):
+        Like.objects.create(post=self.post, profile=self.user.profile)
+        self.client.credentials()
+        response = self.client.get(POSTS_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any(post["liked_by_user"] for post in response.data["results"])
         )
-        self.token = RefreshToken.for_user(self.user)
-        self.client.credentials(
-            HTTP_AUTHORIZATION=f"Bearer {self.token.access_token}"
+
+    def test_get_list_posts_endpoint_filtered_by_hashtags(self):
+        test, django = HashTag.objects.bulk_create(
+            [HashTag(caption="test"), HashTag(caption="django")]
         )
-        self.post = Post.objects.create(
-            title="Test Post",
-            content="This is a test post.",
-            author=self.user.profile,
+        Post.hashtags.through.objects.bulk_create(
+            [
+                Post.hashtags.through(post=self.post, hashtag=test),
+                Post.hashtags.through(post=self.post_2, hashtag=django),
+            ]
         )
-        self.user_2 = get_user_model().objects.create_user(
-            email="test2@test.com",
-            password="testpassword2",
-            first_name="Jane",
-            last_name="Doe",
+
+        response = self.client.get(POSTS_LIST_URL, data={"hashtags": "test"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+        self.assertEqual(response.data["results"][0]["title"], self.post.title)
+
+    def test_post_matching_several_hashtags_is_listed_once(self):
+        test, django = HashTag.objects.bulk_create(
+            [HashTag(caption="test"), HashTag(caption="django")]
         )
-        self.post_2 = Post.objects.create(
-            title="Test Post 2",
-            content="This is a test post 2.",
-            author=self.user_2.profile,
+        self.post.hashtags.add(test, django)
+
+        response = self.client.get(
+            POSTS_LIST_URL, data={"hashtags": "test,django"}
         )
-        
-    def test_get_list_posts_endpoint(self):
-        url = reverse("social_network:posts-list")
-        response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]["id"], self.post_2.id)
-        self.assertEqual(response.data[0]["title"], self.post_2.title)
-        self.assertEqual(response.data[1]["id"], self.post.id)
-        self.assertEqual(response.data[1]["title"], self.post.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
 
-    def test_get_list_posts_endpoint_filtered_by_hashtags(self):
+    def test_hashtags_filter_ignores_blank_and_repeated_captions(self):
         self.post.hashtags.add(HashTag.objects.create(caption="test"))
-        self.post_2.hashtags.add(HashTag.objects.create(caption="django"))
 
-        url = reverse("social_network:posts-list")
-        response = self.client.get(url, data={"hashtags": "test"})
+        response = self.client.get(
+            POSTS_LIST_URL, data={"hashtags": " ,Test, test,"}
+        )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.post.id)
-        self.assertEqual(response.data[0]["title"], self.post.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+
+    def test_hashtags_filter_keeps_first_sorted_captions(self):
+        captions = [f"tag{i:02}" for i in range(MAX_HASHTAG_FILTERS + 1)]
+        self.post.hashtags.add(HashTag.objects.create(caption=captions[0]))
+        self.post_2.hashtags.add(
+            HashTag.objects.create(caption=captions[-1])
+        )
+
+        response = self.client.get(
+            POSTS_LIST_URL, data={"hashtags": ",".join(reversed(captions))}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+
+    def test_hashtags_are_stored_lower_cased(self):
+        response = self.client.post(
+            POSTS_LIST_URL,
+            {
+                "title": "New Post",
+                "content": "This is a new post.",
+                "hashtags": ["Django"],
+            },
+        )
+        self.assertEqual(response.data["hashtags_objects"], ["django"])
+
+        response = self.client.get(POSTS_LIST_URL, data={"hashtags": "DJANGO"})
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "New Post")
 
     def test_get_list_posts_endpoint_filtered_by_author_username(self):
         self.post.author.username = "testuser"
         self.post.author.save()
-        url = reverse("social_network:posts-list")
-        response = self.client.get(url, data={"author_username": "testuser"})
+        response = self.client.get(
+            POSTS_LIST_URL, data={"author_username": "testuser"}
+        )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.post.id)
-        self.assertEqual(response.data[0]["title"], self.post.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+        self.assertEqual(response.data["results"][0]["title"], self.post.title)
 
     def test_retrieve_post_endpoint(self):
         url = reverse(
@@ -82,18 +182,84 @@ class PostViewSetTests(APITestCase):
         self.assertEqual(response.data["id"], self.post.id)
         self.assertEqual(response.data["title"], self.post.title)
 
+    def test_retrieve_post_endpoint_nests_likes_and_comments(self):
+        Like.objects.create(post=self.post, profile=self.user_2.profile)
+        comment = Comment.objects.create(
+            post=self.post,
+            author=self.user_2.profile,
+            content="Nice post!",
+        )
+        url = reverse(
+            "social_network:posts-detail",
+            args=[self.post.pk]
+        )
+        # The user with their profile, the post with its likes and comments
+        # and the hashtags prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["likes"][0]["liked_by"],
+            self.user_2.profile.username
+        )
+        self.assertEqual(response.data["comments"][0]["id"], comment.id)
+        self.assertEqual(
+            response.data["comments"][0]["commented_at"],
+            comment.commented_at.isoformat().replace("+00:00", "Z")
+        )
+
+    def test_retrieve_post_endpoint_embeds_first_page_of_comments(self):
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.user.profile, content=str(i))
+            for i in range(21)
+        )
+        url = reverse(
+            "social_network:posts-detail",
+            args=[self.post.pk]
+        )
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["comments"]), 20)
+        self.assertTrue(
+            response.data["comments_url"].endswith(
+                reverse(
+                    "social_network:post-comments-list",
+                    args=[self.post.pk]
+                )
+            )
+        )
+        self.assertIsNone(response.data["likes_url"])
+
+    def test_post_likes_endpoint(self):
+        Like.objects.create(post=self.post, profile=self.user.profile)
+        Like.objects.create(post=self.post, profile=self.user_2.profile)
+        url = reverse("social_network:posts-likes", args=[self.post.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
     def test_create_post_endpoint(self):
-        url = reverse("social_network:posts-list")
         data = {
             "title": "New Post",
             "content": "This is a new post.",
             "hashtags": ["test", "django"]
         }
-        response = self.client.post(url, data)
+        response = self.client.post(POSTS_LIST_URL, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["title"], data["title"])
         self.assertEqual(response.data["content"], data["content"])
         self.assertEqual(len(response.data["hashtags_objects"]), 2)
+
+
+    def test_create_post_with_invalid_hashtag_returns_400(self):
+        data = {
+            "title": "New Post",
+            "content": "This is a new post.",
+            "hashtags": ["test", ""],
+        }
+        response = self.client.post(POSTS_LIST_URL, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("1", response.json()["hashtags"])
     
     def test_upload_image_endpoint(self):
         url = reverse(
@@ -107,26 +273,44 @@ class PostViewSetTests(APITestCase):
             response.data["detail"],
             "Image uploaded successfully."
         )
+        self.post.refresh_from_db(fields=["image"])
+        self.assertEqual(self.post.image.name, "test_image.jpg")
 
     def test_my_posts_endpoint(self):
-        url = reverse("social_network:posts-my-posts")
-        response = self.client.get(url)
+        response = self.client.get(MY_POSTS_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.post.id)
-        self.assertEqual(response.data[0]["title"], self.post.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+        self.assertEqual(response.data["results"][0]["title"], self.post.title)
+
+    def test_my_posts_endpoint_query_count_does_not_grow(self):
+        Post.objects.create(
+            title="Test Post 3",
+            content="This is a test post 3.",
+            author=self.user.profile,
+        ).hashtags.add(HashTag.objects.create(caption="test"))
+        self.post.hashtags.add(HashTag.objects.create(caption="django"))
+        # The user with their profile, the posts with their authors and the
+        # hashtags prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(MY_POSTS_URL)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_followees_posts_endpoint(self):
         FollowingInteraction.objects.create(
             follower=self.user.profile,
             followee=self.user_2.profile
         )
-        url = reverse("social_network:posts-followees-posts")
-        response = self.client.get(url)
+        # The user with their profile, the followees' posts and the
+        # hashtags prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(FOLLOWEES_POSTS_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.post_2.id)
-        self.assertEqual(response.data[0]["title"], self.post_2.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post_2.id)
+        self.assertEqual(
+            response.data["results"][0]["title"], self.post_2.title
+        )
 
     def test_like_post_endpoint(self):
         url = reverse(
@@ -135,17 +319,12 @@ class PostViewSetTests(APITestCase):
         )
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(self.post.likes.count(), 1)
-        self.assertEqual(self.post_2.likes.count(), 0)
+        self.assertEqual(response.data["likes_count"], 1)
 
-        url = reverse(
-            "social_network:posts-like",
-            args=[self.post.pk]
-        )
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
-        self.assertEqual(self.post.likes.count(), 1)
-        self.assertEqual(self.post_2.likes.count(), 0)
+        self.assertEqual(response.data["likes_count"], 1)
+        self.assertFalse(self.post_2.likes.exists())
 
     def test_unlike_post_endpoint(self):
         Like.objects.create(post=self.post, profile=self.user.profile)
@@ -155,42 +334,75 @@ class PostViewSetTests(APITestCase):
         )
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(self.post.likes.count(), 0)
-        self.assertEqual(self.post_2.likes.count(), 0)
+        self.assertEqual(response.data["likes_count"], 0)
 
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["likes_count"], 0)
+
+    def test_unlike_deletes_without_loading_likes(self):
+        Like.objects.create(post=self.post, profile=self.user.profile)
         url = reverse(
             "social_network:posts-unlike",
             args=[self.post.pk]
         )
-        response = self.client.post(url)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(self.post.likes.count(), 0)
-        self.assertEqual(self.post_2.likes.count(), 0)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        like_queries = [
+            query["sql"] for query in queries
+            if '"social_network_like"' in query["sql"]
+        ]
+        self.assertEqual(len(like_queries), 1)
+        self.assertTrue(like_queries[0].startswith("DELETE"))
+
+    def test_likes_count_is_maintained_by_database(self):
+        stale_post = Post.objects.get(pk=self.post.pk)
+        like = Like.objects.create(post=self.post, profile=self.user.profile)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        stale_post.title = "Updated title"
+        stale_post.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_bulk_like_posts_endpoint(self):
+        Like.objects.create(post=self.post, profile=self.user.profile)
+        response = self.client.post(
+            BULK_LIKE_URL,
+            {"post_ids": [self.post.pk, self.post_2.pk, 10**6]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post.likes.count(), 1)
+        self.assertEqual(self.post_2.likes.count(), 1)
 
     def test_liked_posts_endpoint(self):
         Like.objects.create(post=self.post, profile=self.user.profile)
-        url = reverse("social_network:posts-liked")
-        response = self.client.get(url)
+        response = self.client.get(LIKED_POSTS_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.post.id)
-        self.assertEqual(response.data[0]["title"], self.post.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+        self.assertEqual(response.data["results"][0]["title"], self.post.title)
     
     @patch("social_network.views.create_scheduled_post.apply_async")
     def test_schedule_post(self, mock_apply_async):
-        scheduled_time = datetime.now() + timedelta(days=1)
+        scheduled_time = datetime(2030, 1, 1, 12, 0)
         data = {
             "title": "Scheduled Post",
             "content": "This is a scheduled post.",
             "hashtags": ["test", "django"],
             "scheduled_at": scheduled_time.isoformat()
         }
-        url = reverse("social_network:posts-list")
-        response = self.client.post(url, data, format="json")
+        response = self.client.post(POSTS_LIST_URL, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
-        cet = zoneinfo.ZoneInfo("Europe/Prague")
-        scheduled_time_cet = scheduled_time.replace(tzinfo=cet)
+        scheduled_time_cet = scheduled_time.replace(tzinfo=PRAGUE)
 
         post_data = {
             "title": data["title"],
@@ -204,3 +416,82 @@ class PostViewSetTests(APITestCase):
             eta=scheduled_time_cet,
             kwargs={"post_data": post_data}
         )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+)
+class PostListCacheTests(APITestCase):
+    url = POSTS_LIST_URL
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.user_2 = bulk_create_users(
+            {"email": "test@test.com"},
+            {"email": "test2@test.com"},
+        )
+        cls.post = Post.objects.create(
+            title="Test Post",
+            content="This is a test post.",
+            author=cls.user.profile,
+        )
+        cls.auth_header = bearer_for(cls.user.pk)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
+
+    def test_repeated_list_is_served_from_cache(self):
+        self.client.get(self.url)
+        # Only the JWT authentication lookup of the user and their profile
+        # hits the database.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.post.id)
+        self.assertIn("Authorization", response["Vary"])
+
+    def test_like_invalidates_cached_list(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.data["results"][0]["liked_by_user"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.post, profile=self.user.profile)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["likes_count"], 1)
+        self.assertTrue(response.data["results"][0]["liked_by_user"])
+
+    def test_feeds_are_cached_per_action(self):
+        self.client.get(self.url)
+        response = self.client.get(LIKED_POSTS_URL)
+        self.assertEqual(response.data["results"], [])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(LIKED_POSTS_URL)
+        self.assertEqual(response.data["results"], [])
+
+    def test_follow_invalidates_cached_followees_posts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(
+                title="Followee Post",
+                content="This is a followee's post.",
+                author=self.user_2.profile,
+            )
+        response = self.client.get(FOLLOWEES_POSTS_URL)
+        self.assertEqual(response.data["results"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "social_network:profiles-follow",
+                    args=[self.user_2.profile.pk],
+                )
+            )
+
+        response = self.client.get(FOLLOWEES_POSTS_URL)
+        self.assertEqual(len(response.data["results"]), 1)
@@ -1,12 +1,17 @@
+from unittest.mock import patch
+
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
 from rest_framework import status
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from social_network.models import FollowingInteraction
 from social_network.serializers import EmptySerializer
+from social_network.tests.helpers import bearer_for, bulk_create_users
 from social_network.views import ProfileViewSet
 
 
@@ -15,9 +20,12 @@ PROFILES_LIST_URL = reverse("social_network:profiles-list")
 
 
 def sample_user_profile(**params):
+    """
+    Creates a user with an unusable password: the tests authenticate with
+    JWT, so hashing a password would only slow them down.
+    """
     defaults = {
         "email": "test@test.com",
-        "password": "testpassword",
         "first_name": "Test_first_name",
         "last_name": "Test_last_name",
     }
@@ -26,23 +34,24 @@ def sample_user_profile(**params):
 
 
 class CurrentUserProfileViewTests(APITestCase):
-    def setUp(self):
-        self.user = sample_user_profile(
-            email="test@test.com",
-            password="testpassword",
-            first_name="John",
-            last_name="Doe",
-        )
-        self.token = RefreshToken.for_user(self.user)
-        self.client.credentials(
-            HTTP_AUTHORIZATION=f"Bearer {self.token.access_token}"
-        )
-        self.user_2 = sample_user_profile(
-            email="test2@test.com",
-            password="testpassword2",
-            first_name="Jane",
-            last_name="Doe",
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.user_2 = bulk_create_users(
+            {
+                "email": "test@test.com",
+                "first_name": "John",
+                "last_name": "Doe",
+            },
+            {
+                "email": "test2@test.com",
+                "first_name": "Jane",
+                "last_name": "Doe",
+            },
         )
+        cls.auth_header = bearer_for(cls.user.pk)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
 
     def test_get_profile(self):
         response = self.client.get(CURRENT_USER_URL)
@@ -70,6 +79,31 @@ class CurrentUserProfileViewTests(APITestCase):
         self.assertEqual(response.data["username"], "johnny_updated")
         self.assertEqual(response.data["bio"], "Hello, I am John Doe Updated!")
 
+    @patch.object(FileSystemStorage, "save")
+    def test_partial_update_keeps_profile_image(self, mock_save):
+        self.user.profile.profile_image = "profile_images/john-doe.jpg"
+        self.user.profile.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                CURRENT_USER_URL,
+                {"bio": "Hello!"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_save.assert_not_called()
+        updates = [
+            query["sql"] for query in queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("first_name", updates[0])
+        self.user.profile.refresh_from_db()
+        self.assertEqual(
+            self.user.profile.profile_image.name,
+            "profile_images/john-doe.jpg"
+        )
+
     def test_delete_profile(self):
         response = self.client.delete(CURRENT_USER_URL)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -90,6 +124,19 @@ class CurrentUserProfileViewTests(APITestCase):
             self.user_2.profile.pk
         )
 
+    def test_get_current_user_followers_joins_follower_profiles(self):
+        for email in ("test3@test.com", "test4@test.com"):
+            FollowingInteraction.objects.create(
+                follower=sample_user_profile(email=email).profile,
+                followee=self.user.profile
+            )
+        url = reverse("social_network:me-followers")
+        # The user with their profile plus the followers with their
+        # profiles.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 2)
+
     def test_get_current_user_followees(self):
         FollowingInteraction.objects.create(
             follower=self.user.profile, followee=self.user_2.profile
@@ -105,23 +152,24 @@ class CurrentUserProfileViewTests(APITestCase):
 
 
 class ProfileViewSetTests(APITestCase):
-    def setUp(self):
-        self.user = sample_user_profile(
-            email="test@test.com",
-            password="testpassword",
-            first_name="John",
-            last_name="Doe",
-        )
-        self.token = RefreshToken.for_user(self.user)
-        self.client.credentials(
-            HTTP_AUTHORIZATION=f"Bearer {self.token.access_token}"
-        )
-        self.user_2 = sample_user_profile(
-            email="test2@test.com",
-            password="testpassword2",
-            first_name="Jane",
-            last_name="Doe",
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.user_2 = bulk_create_users(
+            {
+                "email": "test@test.com",
+                "first_name": "John",
+                "last_name": "Doe",
+            },
+            {
+                "email": "test2@test.com",
+                "first_name": "Jane",
+                "last_name": "Doe",
+            },
         )
+        cls.auth_header = bearer_for(cls.user.pk)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
 
     def test_get_profile_list_endpoint(self):
         response = self.client.get(PROFILES_LIST_URL)
@@ -131,6 +179,22 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(response.data[0]["id"], self.user.profile.pk)
         self.assertEqual(response.data[1]["id"], self.user_2.profile.pk)
 
+    def test_get_profile_list_anonymous_is_not_following(self):
+        self.client.credentials()
+        response = self.client.get(PROFILES_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any(profile["followed_by_me"] for profile in response.data)
+        )
+
+    def test_get_profile_list_does_not_load_deferred_fields(self):
+        sample_user_profile(email="test3@test.com")
+        # The authenticated user with their profile plus the list itself.
+        with self.assertNumQueries(2):
+            response = self.client.get(PROFILES_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
     def test_retrieve_profile_endpoint(self):
         url = reverse(
             "social_network:profiles-detail",
@@ -140,6 +204,24 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.user.profile.id)
 
+    def test_retrieve_profile_joins_followers_and_followees(self):
+        FollowingInteraction.objects.create(
+            follower=self.user.profile, followee=self.user_2.profile
+        )
+        url = reverse(
+            "social_network:profiles-detail",
+            args=[self.user_2.profile.pk]
+        )
+        # The user with their profile, the profile and one query per
+        # relation.
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["followers"][0]["profile_id"],
+            self.user.profile.pk
+        )
+
     def test_follow_profile_endpoint(self):
         url = reverse(
             "social_network:profiles-follow",
@@ -150,6 +232,17 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(self.user.profile.followees.count(), 1)
         self.assertEqual(self.user_2.profile.followers.count(), 1)
 
+    def test_follow_totals_are_maintained_by_database(self):
+        url = reverse(
+            "social_network:profiles-follow",
+            args=[self.user_2.profile.pk]
+        )
+        self.client.post(url)
+        self.user.profile.refresh_from_db()
+        self.user_2.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.followees_total, 1)
+        self.assertEqual(self.user_2.profile.followers_total, 1)
+
     def test_follow_profile_endpoint_twice(self):
         url = reverse(
             "social_network:profiles-follow",
@@ -197,6 +290,24 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(self.user.profile.followees.count(), 0)
         self.assertEqual(self.user_2.profile.followers.count(), 0)
 
+    def test_unfollow_deletes_without_loading_interactions(self):
+        FollowingInteraction.objects.create(
+            follower=self.user.profile, followee=self.user_2.profile
+        )
+        url = reverse(
+            "social_network:profiles-unfollow",
+            args=[self.user_2.profile.pk]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        interaction_queries = [
+            query["sql"] for query in queries
+            if '"social_network_followinginteraction"' in query["sql"]
+        ]
+        self.assertEqual(len(interaction_queries), 1)
+        self.assertTrue(interaction_queries[0].startswith("DELETE"))
+
     def test_unfollow_self_endpoint(self):
         url = reverse(
             "social_network:profiles-unfollow",
@@ -238,6 +349,17 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["id"], self.user_2.profile.pk)
 
+    def test_profile_search_ignores_case_and_matches_substrings(self):
+        self.user_2.profile.username = "JaneDoe"
+        self.user_2.profile.save()
+        response = self.client.get(
+            PROFILES_LIST_URL,
+            data={"username": "nEdO"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["id"], self.user_2.profile.pk)
+
     def test_retrieve_profile_list_endpoint_filtered_by_first_name(self):
         self.user_2.profile.first_name = "Jane"
         self.user_2.profile.save()
@@ -259,3 +381,14 @@ class ProfileViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["id"], self.user_2.profile.pk)
+
+    def test_profile_search_requires_every_term_to_match(self):
+        self.user_2.profile.username = "janedoe"
+        self.user_2.profile.first_name = "Jane"
+        self.user_2.profile.save()
+        response = self.client.get(
+            PROFILES_LIST_URL,
+            data={"username": "jane", "first_name": "John"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 0)
@@ -1,15 +1,34 @@
+import ast
+import inspect
 import os
+import textwrap
 import uuid
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 
 from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
 
-from social_network.models import Post
+from social_network.authentication import ProfileJWTAuthentication
+from social_network.cache import (
+    bump_list_version_on_commit,
+    get_list_version,
+)
+from social_network.models import HashTag
 from social_network.permissions import IsOwnerOrReadOnly
+from social_network.serializers import (
+    ProfileListSerializer,
+    ProfileSerializer,
+)
 from social_network.upload_to_path import UploadToPath
 from social_network.tasks import create_scheduled_post
 from social_network.views import PostViewSet, ProfileViewSet
@@ -24,29 +43,28 @@ class TestUploadToPath(TestCase):
 
     @patch("uuid.uuid4")
     def test_get_filename_with_name(self, mock_uuid):
-        mock_uuid.return_value = "1234"
-        instance = MagicMock()
-        instance.first_name = "John"
-        instance.last_name = "Doe"
+        mock_uuid.return_value = uuid.UUID(
+            "12345678-1234-5678-1234-567812345678"
+        )
+        instance = SimpleNamespace(first_name="John", last_name="Doe")
         filename = self.upload_path.get_filename(instance, "test.jpg")
-        self.assertTrue(filename.startswith("john-doe-1234"))
+        self.assertEqual(
+            filename, "john-doe-12345678123456781234567812345678.jpg"
+        )
     
     @patch("uuid.uuid4")
     def test_get_filename_with_title(self, mock_uuid):
         mock_uuid.return_value = uuid.UUID(
             "12345678-1234-5678-1234-567812345678"
         )
-        instance = MagicMock(spec="title")
-        instance.title="Test Title"
+        instance = SimpleNamespace(title="Test Title")
         filename = self.upload_path.get_filename(instance, "test.jpg")
         expected_slug = slugify(instance.title)
-        self.assertTrue(filename.startswith(f"{expected_slug}-12345678-"))
+        self.assertTrue(filename.startswith(f"{expected_slug}-12345678123"))
         self.assertTrue(filename.endswith(".jpg"))
 
     def test_generate_upload_path_with_name(self):
-        instance = MagicMock(spec_set=["first_name", "last_name"])
-        instance.first_name = "John"
-        instance.last_name = "Doe"
+        instance = SimpleNamespace(first_name="John", last_name="Doe")
         filename = self.upload_path.generate_upload_path(instance, "test.jpg")
 
         normalized_filename = filename.replace("\\", "/")
@@ -55,8 +73,7 @@ class TestUploadToPath(TestCase):
         self.assertTrue(filename.endswith(".jpg"))
     
     def test_generate_upload_path_with_title(self):
-        instance = MagicMock(spec="title")
-        instance.title = "Test Title"
+        instance = SimpleNamespace(title="Test Title")
         filename = self.upload_path.generate_upload_path(instance, "test.jpg")
 
         normalized_filename = filename.replace("\\", "/")
@@ -65,23 +82,15 @@ class TestUploadToPath(TestCase):
         self.assertTrue(normalized_filename.endswith(".jpg"))
 
     def test_generate_upload_path_with_extension(self):
-        instance = MagicMock()
-        instance.first_name = "John"
-        instance.last_name = "Doe"
+        instance = SimpleNamespace(first_name="John", last_name="Doe")
         filename = self.upload_path.generate_upload_path(instance, "test.jpg")
         self.assertTrue(filename.endswith(".jpg"))
 
 
 class CreateScheduledPostTaskTest(TestCase):
     @patch("social_network.tasks.Post")
-    @patch("social_network.tasks.Profile")
     @patch("social_network.tasks.HashTag")
-    def test_create_scheduled_post(
-        self,
-        mock_HashTag,
-        mock_Profile,
-        mock_Post
-    ):
+    def test_create_scheduled_post(self, mock_HashTag, mock_Post):
         post_data = {
             "title": "Test Post",
             "content": "This is a test post.",
@@ -90,50 +99,186 @@ class CreateScheduledPostTaskTest(TestCase):
             "scheduled_at": None
         }
 
-        mock_author = MagicMock()
-        mock_Profile.objects.get.return_value = mock_author
-
         mock_post = MagicMock()
         mock_Post.objects.create.return_value = mock_post
 
         mock_hashtag = MagicMock()
-        mock_HashTag.objects.get_or_create.return_value = (mock_hashtag, True)
+        mock_HashTag.objects.get_or_create_many.return_value = [mock_hashtag]
 
         create_scheduled_post(post_data.copy())
 
-        mock_Profile.objects.get.assert_called_once_with(
-            pk=post_data["author_id"]
-        )
         mock_Post.objects.create.assert_called_once_with(
-            author=mock_author,
+            author_id=post_data["author_id"],
             title=post_data["title"],
             content=post_data["content"]
         )
-        for hashtag in ["test", "django"]:
-            mock_HashTag.objects.get_or_create.assert_any_call(caption=hashtag)
-        self.assertEqual(mock_post.hashtags.set.call_count, 1)
+        mock_HashTag.objects.get_or_create_many.assert_called_once_with(
+            ["test", "django"]
+        )
+        mock_post.hashtags.set.assert_called_once_with([mock_hashtag])
+
+    def test_create_scheduled_post_query_count_does_not_grow_with_tags(self):
+        author = get_user_model().objects.create_user(
+            email="test@test.com"
+        ).profile
+        HashTag.objects.create(caption="existing")
+
+        def run(captions):
+            with CaptureQueriesContext(connection) as queries:
+                create_scheduled_post(
+                    {
+                        "title": "Test Post",
+                        "content": "This is a test post.",
+                        "author_id": author.pk,
+                        "hashtags": captions,
+                    }
+                )
+            return len(queries)
 
+        few = run(["existing", "new"])
+        many = run(["existing"] + [f"new_{i}" for i in range(10)])
+        self.assertEqual(few, many)
+        self.assertEqual(HashTag.objects.count(), 12)
 
-class TestIsOwnerOrReadOnly(TestCase):
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+)
+class HashTagManagerCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_or_create_many_serves_known_captions_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            created = HashTag.objects.get_or_create_many(["test", "django"])
+
+        with self.assertNumQueries(0):
+            cached = HashTag.objects.get_or_create_many(["test", "django"])
+        self.assertEqual(
+            {(hashtag.id, hashtag.caption) for hashtag in cached},
+            {(hashtag.id, hashtag.caption) for hashtag in created},
+        )
+
+    def test_deleted_hashtag_is_dropped_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            HashTag.objects.get_or_create_many(["test"])
+        HashTag.objects.get(caption="test").delete()
+
+        hashtags = HashTag.objects.get_or_create_many(["test"])
+        self.assertTrue(HashTag.objects.filter(pk=hashtags[0].pk).exists())
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+)
+class ListVersionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_bumped_on_commit(self):
+        version = get_list_version("posts")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            bump_list_version_on_commit("posts")
+        self.assertEqual(get_list_version("posts"), version)
+
+        callbacks[0]()
+        self.assertEqual(get_list_version("posts"), version + 1)
+
+
+class ProfileJWTAuthenticationTest(TestCase):
     def setUp(self):
-        self.factory = APIRequestFactory()
         self.user = get_user_model().objects.create_user(
-            email="test@test.com",
-            password="testpassword",
-            first_name="John",
-            last_name="Doe",
-        )
-        self.user_2 = get_user_model().objects.create_user(
-            email="test2@test.com",
-            password="testpassword2",
-            first_name="Jane",
-            last_name="Doe",
-        )
-        self.post = Post.objects.create(
-            title="Test Post",
-            content="This is a test post.",
-            author=self.user.profile,
+            email="test@test.com", password="testpassword"
+        )
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, user):
+        token = AccessToken.for_user(user)
+        request = self.factory.get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        return ProfileJWTAuthentication().authenticate(request)
+
+    def test_user_is_loaded_with_profile(self):
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(self.user)
+            self.assertEqual(user.profile.pk, self.user.profile.pk)
+
+    def test_upstream_get_user_only_uses_stubbed_attributes(self):
+        # ProfileJWTAuthentication relies on simplejwt's get_user reading
+        # the user model only through `objects.get` and `DoesNotExist`;
+        # fail loudly when an upgrade changes that.
+        tree = ast.parse(
+            textwrap.dedent(inspect.getsource(JWTAuthentication.get_user))
+        )
+        used = [
+            node.attr
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Attribute)
+            and node.value.attr == "user_model"
+        ]
+        uses = sum(
+            isinstance(node, ast.Attribute) and node.attr == "user_model"
+            for node in ast.walk(tree)
+        )
+        self.assertEqual(set(used), {"objects", "DoesNotExist"})
+        # The model itself is never passed anywhere.
+        self.assertEqual(uses, len(used))
+        self.assertIn("self.user_model.objects.get(", ast.unparse(tree))
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed) as raised:
+            self.authenticate(self.user)
+        self.assertEqual(raised.exception.detail["code"], "user_inactive")
+
+    def test_deleted_user_is_rejected(self):
+        user = get_user_model()(pk=self.user.pk + 1000)
+
+        with self.assertRaises(AuthenticationFailed) as raised:
+            self.authenticate(user)
+        self.assertEqual(raised.exception.detail["code"], "user_not_found")
+
+
+class CachedFieldsModelSerializerTest(TestCase):
+    def test_fields_are_cached_per_class_and_copied_per_instance(self):
+        fields = ProfileSerializer().get_fields()
+        list_fields = ProfileListSerializer().get_fields()
+
+        self.assertNotIn("followers_total", fields)
+        self.assertIn("followers_total", list_fields)
+        self.assertIsNot(
+            ProfileSerializer().get_fields()["username"],
+            fields["username"],
+        )
+
+
+class TestIsOwnerOrReadOnly(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = SimpleNamespace(
+            pk=1,
+            is_authenticated=True,
+            profile=SimpleNamespace(pk=1, user_id=1),
+        )
+        self.user_2 = SimpleNamespace(
+            pk=2,
+            is_authenticated=True,
+            profile=SimpleNamespace(pk=2, user_id=2),
         )
+        self.post = SimpleNamespace(pk=1, author_id=self.user.profile.pk)
         self.permission = IsOwnerOrReadOnly()
 
     def test_has_object_permission_read_only(self):
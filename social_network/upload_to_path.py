@@ -1,3 +1,4 @@
+import functools
 import os
 import uuid
 
@@ -6,6 +7,13 @@ from django.utils.encoding import force_str
 from django.utils.text import slugify
 
 
+@functools.lru_cache(maxsize=1024)
+def _slug(first_name: str, last_name: str, title: str) -> str:
+    if first_name is not None and last_name is not None:
+        return slugify(f"{first_name}-{last_name}")
+    return slugify(title or "")
+
+
 @deconstructible
 class UploadToPath:
     """
@@ -13,20 +21,22 @@ class UploadToPath:
     """
     def __init__(self, upload_to: str) -> None:
         self.upload_to = upload_to
+        self._directory_name = os.path.normpath(force_str(upload_to))
 
     def __call__(self, instance: object, filename: str) -> str:
         return self.generate_upload_path(instance, filename)
 
     def get_directory_name(self) -> str:
-        return os.path.normpath(force_str(self.upload_to))
+        return self._directory_name
 
     def get_filename(self, instance: object, filename: str) -> str:
         _, extension = os.path.splitext(filename)
-        if hasattr(instance, "first_name") and hasattr(instance, "last_name"):
-            slug_base = slugify(f"{instance.first_name}-{instance.last_name}")
-        elif hasattr(instance, "title"):
-            slug_base = slugify(instance.title)
-        return f"{slug_base}-{uuid.uuid4()}{extension}"
+        slug_base = _slug(
+            getattr(instance, "first_name", None),
+            getattr(instance, "last_name", None),
+            getattr(instance, "title", None),
+        )
+        return f"{slug_base}-{uuid.uuid4().hex}{extension}"
 
     def generate_upload_path(self, instance: object, filename: str) -> str:
         return os.path.join(
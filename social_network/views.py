@@ -1,8 +1,13 @@
 import zoneinfo
 
-from django.db.models import Count, Exists, OuterRef, Subquery
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q, Value
+from django.db.models.functions import JSONObject
 from django.db.models.query import QuerySet
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
 
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import viewsets
@@ -10,16 +15,23 @@ from rest_framework import generics
 from rest_framework import mixins, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework import serializers
 
 from drf_spectacular.utils import (
     extend_schema,
+    extend_schema_view,
     OpenApiParameter,
     OpenApiResponse,
     OpenApiExample,
 )
 from drf_spectacular.types import OpenApiTypes
 
+from social_network.cache import (
+    LIST_CACHE_TIMEOUT,
+    bump_list_version_on_commit,
+    list_cache_key,
+)
 from social_network.models import (
     Comment,
     FollowingInteraction,
@@ -29,59 +41,74 @@ from social_network.models import (
     Profile,
 )
 from social_network.serializers import (
+    BulkLikeSerializer,
     CommentSerializer,
+    LikeSerializer,
     PostDetailSerializer,
     PostImageSerializer,
     ProfileSerializer,
     ProfileListSerializer,
     ProfileDetailSerializer,
     EmptySerializer,
-    FollowerSerializer,
-    FolloweeSerializer,
+    FollowingProfileSerializer,
     PostSerializer,
     PostListSerializer,
 )
 
+from social_network.pagination import (
+    EMBEDDED_PAGE_SIZE,
+    CommentCursorPagination,
+    LikeCursorPagination,
+    PostCursorPagination,
+)
 from social_network.permissions import IsOwnerOrReadOnly
 from social_network.tasks import create_scheduled_post
 
 
-class CurrentUserProfileView(generics.RetrieveUpdateDestroyAPIView):
-    serializer_class = ProfileSerializer
-    permission_classes = (IsAuthenticated,)
+BULK_CREATE_BATCH_SIZE = 50
+SCHEDULED_POSTS_TIMEZONE = zoneinfo.ZoneInfo("Europe/Prague")
+# Captions beyond this many (in sorted order) in the `hashtags` filter are
+# ignored.
+MAX_HASHTAG_FILTERS = 20
 
-    def get_object(self) -> Profile:
-        return generics.get_object_or_404(self.get_queryset())
 
-    def get_queryset(self) -> QuerySet[Profile]:
-        return (
-            Profile.objects.filter(user=self.request.user)
-            .select_related("user")
-            .prefetch_related("followees", "followers")
-            .annotate(
-                followers_total=Count("followers"),
-                followees_total=Count("followees")
-            )
-        )
+class CachedListMixin:
+    """
+    Caches the serialized list response per action, viewer and query
+    string. Entries are invalidated by the signals bumping
+    `list_cache_namespace`.
+    """
 
-    @extend_schema(
-        summary="Delete the current user's profile",
-        description="Delete the profile of the currently authenticated user.",
-        responses={
-            204: OpenApiResponse(description="Profile deleted successfully."),
-            401: OpenApiResponse(
-                description="Authentication credentials were not provided."
-            ),
-        },
-    )
-    def destroy(self, request, *args, **kwargs) -> Response:
-        profile = self.get_object()
-        user = profile.user
-        response = super().destroy(request, *args, **kwargs)
-        user.delete()
+    list_cache_namespace = None
+    list_cache_timeout = LIST_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs) -> Response:
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, get_response, *args, **kwargs) -> Response:
+        """
+        Returns the cached data of the current action, or calls
+        `get_response(*args, **kwargs)` and caches its data.
+        """
+        key = list_cache_key(
+            self.list_cache_namespace,
+            self.action,
+            self.request.user.pk or 0,
+            self.request.query_params,
+        )
+        data = cache.get(key)
+        if data is None:
+            response = get_response(*args, **kwargs)
+            cache.set(key, response.data, self.list_cache_timeout)
+        else:
+            response = Response(data)
+        # The payload depends on the viewer, e.g. liked_by_user.
+        patch_vary_headers(response, ("Authorization",))
         return response
 
-    @extend_schema(
+
+@extend_schema_view(
+    get=extend_schema(
         summary="Retrieve the current user's profile",
         description="Retrieve the profile of currently authenticated user.",
         responses={
@@ -110,11 +137,8 @@ class CurrentUserProfileView(generics.RetrieveUpdateDestroyAPIView):
                 description="Authentication credentials were not provided."
             ),
         },
-    )
-    def get(self, request, *args, **kwargs) -> Response:
-        return super().retrieve(request, *args, **kwargs)
-
-    @extend_schema(
+    ),
+    put=extend_schema(
         summary="Update the current user's profile",
         description="Update the profile of the currently authenticated user.",
         request=ProfileSerializer,
@@ -158,12 +182,39 @@ class CurrentUserProfileView(generics.RetrieveUpdateDestroyAPIView):
             ),
             400: OpenApiResponse(description="Bad request."),
         },
-    )
-    def put(self, request, *args, **kwargs) -> Response:
-        return super().update(request, *args, **kwargs)
+    ),
+    delete=extend_schema(
+        summary="Delete the current user's profile",
+        description="Delete the profile of the currently authenticated user.",
+        responses={
+            204: OpenApiResponse(description="Profile deleted successfully."),
+            401: OpenApiResponse(
+                description="Authentication credentials were not provided."
+            ),
+        },
+    ),
+)
+class CurrentUserProfileView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = ProfileSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_object(self) -> Profile:
+        return generics.get_object_or_404(self.get_queryset())
+
+    def get_queryset(self) -> QuerySet[Profile]:
+        return (
+            Profile.objects.filter(user=self.request.user)
+            .select_related("user")
+        )
+
+    def destroy(self, request, *args, **kwargs) -> Response:
+        # Profile.user cascades, so deleting the user removes the profile.
+        request.user.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class ProfileViewSet(
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -176,6 +227,14 @@ class ProfileViewSet(
     The view is restricted to authenticated users only.
     """
     permission_classes = (IsOwnerOrReadOnly,)
+    owned_by_user = True
+    list_cache_namespace = "profiles"
+    # Search parameters and the lower-cased generated columns they match.
+    search_lookups = {
+        "username": "username_lower__contains",
+        "first_name": "first_name_lower__contains",
+        "last_name": "last_name_lower__contains",
+    }
 
     def get_serializer_class(self) -> serializers.BaseSerializer:
         if self.action == "list":
@@ -188,50 +247,64 @@ class ProfileViewSet(
 
     def get_queryset(self) -> QuerySet[Profile]:
         """
-        Returns a QuerySet of Profile objects, annotated with the total number
-        of followers and followees each profile has.
-        If the user is authenticated, the QuerySet is further annotated with
-        a boolean indicating whether the current user follows each profile.
+        Returns a QuerySet of Profile objects annotated with a boolean
+        indicating whether the current user follows each profile (always
+        False for anonymous users).
 
         The QuerySet can be filtered by the query parameters "username",
         "first_name", and "last_name", if any of them are present.
 
-        :return: A distinct QuerySet of Profile objects
+        :return: A QuerySet of Profile objects
         """
-        queryset = (
-            Profile.objects.select_related("user")
-            .prefetch_related("followers__follower", "followees__followee")
-            .annotate(
-                followers_total=Count("followers", distinct=True),
-                followees_total=Count("followees", distinct=True),
+        if self.action == "list":
+            queryset = Profile.objects.only(
+                "id",
+                "profile_image",
+                "username",
+                "first_name",
+                "last_name",
+                "full_name",
+                "followers_total",
+                "followees_total",
             )
-        )
+        else:
+            queryset = Profile.objects.select_related("user").prefetch_related(
+                Prefetch(
+                    "followers",
+                    queryset=FollowingInteraction.objects.with_profile(
+                        "follower"
+                    ),
+                    to_attr="prefetched_followers",
+                ),
+                Prefetch(
+                    "followees",
+                    queryset=FollowingInteraction.objects.with_profile(
+                        "followee"
+                    ),
+                    to_attr="prefetched_followees",
+                ),
+            )
+
         if self.request.user.is_authenticated:
             queryset = queryset.annotate(
                 followed_by_me=Exists(
                     FollowingInteraction.objects.filter(
-                        follower__user=self.request.user,
+                        follower=self.request.user.profile,
                         followee=OuterRef("pk")
                     )
-                ),
-                followers_total=Count("followers", distinct=True),
-                followees_total=Count("followees", distinct=True),
+                )
             )
+        else:
+            queryset = queryset.annotate(followed_by_me=Value(False))
 
-        username = self.request.query_params.get("username")
-        first_name = self.request.query_params.get("first_name")
-        last_name = self.request.query_params.get("last_name")
-
-        if username:
-            queryset = queryset.filter(username__icontains=username)
-
-        if first_name:
-            queryset = queryset.filter(first_name__icontains=first_name)
-
-        if last_name:
-            queryset = queryset.filter(last_name__icontains=last_name)
+        # Combine the search terms into one WHERE clause.
+        search = Q()
+        for param, lookup in self.search_lookups.items():
+            value = self.request.query_params.get(param)
+            if value:
+                search &= Q((lookup, value.lower()))
 
-        return queryset.distinct()
+        return queryset.filter(search)
 
     @extend_schema(
         parameters=[
@@ -258,9 +331,6 @@ class ProfileViewSet(
     def list(self, request, *args, **kwargs) -> Response:
         return super().list(request, *args, **kwargs)
 
-    def get_current_user_profile(self) -> Profile:
-        return get_object_or_404(Profile, user=self.request.user)
-
     @action(
         detail=True,
         methods=["post"],
@@ -268,8 +338,8 @@ class ProfileViewSet(
         permission_classes=[IsAuthenticated],
     )
     def follow(self, request, pk: int) -> Response:
-        follower = self.get_current_user_profile()
-        followee = get_object_or_404(Profile, pk=pk)
+        follower = request.user.profile
+        followee = get_object_or_404(Profile.objects.only("id"), pk=pk)
 
         if follower == followee:
             return Response(
@@ -277,16 +347,20 @@ class ProfileViewSet(
                 status=status.HTTP_409_CONFLICT,
             )
 
-        if follower.followees.filter(followee=followee).exists():
+        # The unique constraint on (follower, followee) turns a repeated
+        # follow into a no-op INSERT.
+        followed = FollowingInteraction.objects.insert_ignoring_conflicts(
+            follower=follower, followee=followee
+        )
+        if not followed:
             return Response(
                 {"detail": "You are already following this user."},
                 status=status.HTTP_409_CONFLICT,
             )
-
-        FollowingInteraction.objects.create(
-            follower=follower,
-            followee=followee
-        )
+        # The INSERT sends no post_save signal. Followees' posts are cached
+        # in the post lists.
+        bump_list_version_on_commit("profiles")
+        bump_list_version_on_commit("posts")
 
         return Response(
             {"detail": "You are now following this user."},
@@ -300,8 +374,8 @@ class ProfileViewSet(
         permission_classes=[IsAuthenticated],
     )
     def unfollow(self, request, pk: int) -> Response:
-        follower = self.get_current_user_profile()
-        followee = get_object_or_404(Profile, pk=pk)
+        follower = request.user.profile
+        followee = get_object_or_404(Profile.objects.only("id"), pk=pk)
 
         if follower == followee:
             return Response(
@@ -309,13 +383,15 @@ class ProfileViewSet(
                 status=status.HTTP_409_CONFLICT,
             )
 
-        if not follower.followees.filter(followee=followee).exists():
+        deleted, _ = follower.followees.filter(followee=followee).delete()
+        if not deleted:
             return Response(
                 {"detail": "You are not following this user."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        follower.followees.filter(followee=followee).delete()
+        # The fast DELETE sends no post_delete signal.
+        bump_list_version_on_commit("profiles")
+        bump_list_version_on_commit("posts")
 
         return Response(
             {"detail": "You are no longer following this user."},
@@ -329,11 +405,11 @@ class CurrentUserProfileFollowersView(generics.ListAPIView):
     follow them. The view is restricted to authenticated users only.
     """
 
-    serializer_class = FollowerSerializer
+    serializer_class = FollowingProfileSerializer
 
     def get_queryset(self) -> QuerySet[FollowingInteraction]:
         user = self.request.user
-        return user.profile.followers.all()
+        return user.profile.followers.with_profile("follower")
 
 
 class CurrentUserProfileFolloweesView(generics.ListAPIView):
@@ -342,51 +418,81 @@ class CurrentUserProfileFolloweesView(generics.ListAPIView):
     follow. The view is restricted to authenticated users only.
     """
 
-    serializer_class = FolloweeSerializer
+    serializer_class = FollowingProfileSerializer
 
     def get_queryset(self) -> QuerySet[FollowingInteraction]:
         user = self.request.user
-        return user.profile.followees.all()
+        return user.profile.followees.with_profile("followee")
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     A view that allows the current user to retrieve, create, update, and
     delete posts. The view is restricted to authenticated users only.
     """
 
     permission_classes = (IsOwnerOrReadOnly,)
+    pagination_class = PostCursorPagination
+    list_cache_namespace = "posts"
+    list_cache_timeout = 30
+    # Actions that render pages of posts with PostListSerializer.
+    list_actions = ("list", "my_posts", "followees_posts", "liked")
 
     def get_queryset(self) -> QuerySet[Post]:
         """
-        Returns a QuerySet of Post objects, annotated with the total number
-        of likes and comments each post has. If the user is authenticated,
-        the QuerySet is further annotated with a boolean indicating whether
-        the current user has liked each post.
+        Returns a QuerySet of Post objects annotated with a boolean
+        indicating whether the current user has liked each post (always
+        False for anonymous users).
 
         The QuerySet can be filtered by the query parameters "hashtags" and
         "author_username", if any of them are present.
 
-        :return: A distinct QuerySet of Post objects
+        :return: A QuerySet of Post objects
         """
-        queryset = (
-            Post.objects.select_related("author")
-            .prefetch_related("hashtags", "likes__profile", "comments__author")
-            .annotate(
-                likes_count=Subquery(
+        queryset = Post.objects.select_related("author").prefetch_related(
+            Prefetch(
+                "hashtags",
+                queryset=HashTag.objects.only("id", "caption"),
+                to_attr="prefetched_hashtags",
+            )
+        )
+
+        if self.action == "retrieve":
+            # Build the first page of likes and comments as JSON arrays in
+            # the post query itself instead of prefetching them separately.
+            queryset = queryset.annotate(
+                likes_data=ArraySubquery(
                     Like.objects.filter(post=OuterRef("pk"))
-                    .values("post")
-                    .annotate(count=Count("post"))
-                    .values("count"),
+                    .order_by("-liked_at")
+                    .values(
+                        json=JSONObject(
+                            id="id",
+                            profile=JSONObject(username="profile__username"),
+                        )
+                    )[:EMBEDDED_PAGE_SIZE]
                 ),
-                comments_count=Subquery(
-                    Comment.objects.filter(post=OuterRef("pk"))
-                    .values("post")
-                    .annotate(count=Count("post"))
-                    .values("count"),
+                comments_data=ArraySubquery(
+                    Comment.objects.filter(post=OuterRef("pk")).values(
+                        json=JSONObject(
+                            id="id",
+                            author=JSONObject(username="author__username"),
+                            content="content",
+                            commented_at="commented_at",
+                        )
+                    )[:EMBEDDED_PAGE_SIZE]
                 ),
             )
-        )
+
+        if self.action in self.list_actions:
+            queryset = queryset.only(
+                "id",
+                "title",
+                "created_at",
+                "likes_count",
+                "comments_count",
+                "author__id",
+                "author__username",
+            )
 
         if self.request.user.is_authenticated:
             user_profile = self.request.user.profile
@@ -398,24 +504,39 @@ class PostViewSet(viewsets.ModelViewSet):
                     )
                 )
             )
+        else:
+            queryset = queryset.annotate(liked_by_user=Value(False))
 
         hashtags = self.request.query_params.get("hashtags")
         author_username = self.request.query_params.get("author_username")
 
         if hashtags:
-            hashtag_list = [
-                hashtag.strip().lower()
-                for hashtag
-                in hashtags.split(",")
-            ]
-            queryset = queryset.filter(hashtags__caption__in=hashtag_list)
+            # Sorted, so the captions kept do not depend on the hash seed.
+            hashtag_list = sorted(
+                {
+                    hashtag.strip().lower()
+                    for hashtag in hashtags.split(",")
+                    if hashtag.strip()
+                }
+            )[:MAX_HASHTAG_FILTERS]
+            # EXISTS keeps a post tagged with several of the captions from
+            # being repeated, which a join on the tags would do.
+            queryset = queryset.filter(
+                Exists(
+                    Post.hashtags.through.objects.filter(
+                        post=OuterRef("pk"),
+                        hashtag__caption__any=hashtag_list,
+                    )
+                )
+            )
 
         if author_username:
+            # Served by the trigram index on the lower-cased username.
             queryset = queryset.filter(
-                author__username__icontains=author_username
+                author__username_lower__contains=author_username.lower()
             )
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -437,7 +558,7 @@ class PostViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self) -> serializers.BaseSerializer:
-        if self.action == "list":
+        if self.action in self.list_actions:
             return PostListSerializer
         if self.action == "retrieve":
             return PostDetailSerializer
@@ -445,40 +566,42 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostImageSerializer
         if self.action in ["like", "unlike"]:
             return EmptySerializer
+        if self.action == "bulk_like":
+            return BulkLikeSerializer
+        if self.action == "likes":
+            return LikeSerializer
         return PostSerializer
 
     def perform_create(self, serializer: PostSerializer) -> None:
         """
-        Saves the post instance with the current user's profile as the author,
-        and associates any provided hashtags with the post.
+        Saves the post instance with the current user's profile as the author;
+        the serializer attaches the provided hashtags. Posts with
+        `scheduled_at` are handed to Celery instead of being saved now.
 
         Args:
             serializer: The serializer containing the validated data
                 for the post to be created.
         """
-        hashtag_data = serializer.validated_data.pop("hashtags", [])
         scheduled_at = serializer.validated_data.pop("scheduled_at", None)
 
-        post_data = {
-            "title": serializer.validated_data["title"],
-            "content": serializer.validated_data["content"],
-            "author_id": self.request.user.profile.pk,
-            "hashtags": hashtag_data,
-            "image": serializer.validated_data.get("image"),
-        }
-
         if scheduled_at:
-            cet = zoneinfo.ZoneInfo("Europe/Prague")
-            scheduled_at = scheduled_at.replace(tzinfo=cet)
+            post_data = {
+                "title": serializer.validated_data["title"],
+                "content": serializer.validated_data["content"],
+                "author_id": self.request.user.profile.pk,
+                "hashtags": serializer.validated_data.pop("hashtags", []),
+                "image": serializer.validated_data.get("image"),
+            }
+            scheduled_at = scheduled_at.replace(
+                tzinfo=SCHEDULED_POSTS_TIMEZONE
+            )
             create_scheduled_post.apply_async(
                 eta=scheduled_at,
                 kwargs={"post_data": post_data}
             )
         else:
-            post = serializer.save(author=self.request.user.profile)
-            for caption in hashtag_data:
-                hashtag, _ = HashTag.objects.get_or_create(caption=caption)
-                post.hashtags.add(hashtag)
+            with transaction.atomic():
+                serializer.save(author=self.request.user.profile)
 
     def create(self, request, *args, **kwargs) -> Response:
         """
@@ -499,10 +622,13 @@ class PostViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated, IsOwnerOrReadOnly],
     )
     def upload_image(self, request, pk: int = None) -> Response:
-        post = get_object_or_404(Post, pk=pk)
+        # The title is read by UploadToPath to name the stored file.
+        post = get_object_or_404(
+            Post.objects.only("id", "author_id", "title", "image"), pk=pk
+        )
         self.check_object_permissions(request, post)
         post.image = request.data["image"]
-        post.save()
+        post.save(update_fields=["image"])
         return Response(
             {"detail": "Image uploaded successfully."},
             status=status.HTTP_200_OK
@@ -513,29 +639,26 @@ class PostViewSet(viewsets.ModelViewSet):
         methods=["get"],
         url_path="my-posts",
         permission_classes=[IsAuthenticated],
+        pagination_class=PostCursorPagination,
     )
     def my_posts(self, request) -> Response:
         queryset = self.get_queryset().filter(author=request.user.profile)
-        serializer = PostSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.cached_response(self.paginated_response, queryset)
 
     @action(
         detail=False,
         methods=["get"],
         url_path="followees-posts",
         permission_classes=[IsAuthenticated],
+        pagination_class=PostCursorPagination,
     )
     def followees_posts(self, request) -> Response:
-        user_profile = request.user.profile
-        followees_profiles = user_profile.followees.values_list(
-            "followee",
-            flat=True
-        )
+        # A single join through the author's followers; the unique
+        # (follower, followee) index serves the lookup.
         followees_posts = self.get_queryset().filter(
-            author__in=followees_profiles
+            author__followers__follower=request.user.profile
         )
-        serializer = PostSerializer(followees_posts, many=True)
-        return Response(serializer.data)
+        return self.cached_response(self.paginated_response, followees_posts)
 
     @action(
         detail=True,
@@ -544,18 +667,32 @@ class PostViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def like(self, request, pk: int) -> Response:
-        post = get_object_or_404(Post, pk=pk)
+        post = get_object_or_404(Post.objects.only("id", "likes_count"), pk=pk)
         user_profile = request.user.profile
 
-        if Like.objects.filter(post=post, profile=user_profile).exists():
+        # The unique constraint on (post, profile) turns a repeated like
+        # into a no-op INSERT.
+        liked = Like.objects.insert_ignoring_conflicts(
+            post=post, profile=user_profile
+        )
+        if not liked:
             return Response(
-                {"detail": "You have already liked this post."},
+                {
+                    "detail": "You have already liked this post.",
+                    "likes_count": post.likes_count,
+                },
                 status=status.HTTP_409_CONFLICT,
             )
+        # The INSERT sends no post_save signal.
+        bump_list_version_on_commit("posts")
 
-        Like.objects.create(post=post, profile=user_profile)
+        # The counter is bumped by a trigger, so read it back.
+        post.refresh_from_db(fields=["likes_count"])
         return Response(
-            {"detail": "You have liked this post."},
+            {
+                "detail": "You have liked this post.",
+                "likes_count": post.likes_count,
+            },
             status=status.HTTP_201_CREATED
         )
 
@@ -566,32 +703,106 @@ class PostViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def unlike(self, request, pk: int) -> Response:
-        post = get_object_or_404(Post, pk=pk)
+        post = get_object_or_404(Post.objects.only("id", "likes_count"), pk=pk)
         user_profile = request.user.profile
 
-        if not Like.objects.filter(post=post, profile=user_profile).exists():
+        deleted, _ = Like.objects.filter(
+            post=post, profile=user_profile
+        ).delete()
+        if not deleted:
             return Response(
-                {"detail": "You have not liked this post."},
+                {
+                    "detail": "You have not liked this post.",
+                    "likes_count": post.likes_count,
+                },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        # The fast DELETE sends no post_delete signal.
+        bump_list_version_on_commit("posts")
 
-        Like.objects.filter(post=post, profile=user_profile).delete()
+        post.refresh_from_db(fields=["likes_count"])
         return Response(
-            {"detail": "You have unliked this post."},
+            {
+                "detail": "You have unliked this post.",
+                "likes_count": post.likes_count,
+            },
             status=status.HTTP_200_OK
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-like",
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_like(self, request) -> Response:
+        """
+        Likes several posts at once, e.g. when a client flushes the likes
+        it queued while offline. Posts that are already liked or do not
+        exist are skipped.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_profile = request.user.profile
+        post_ids = Post.objects.filter(
+            pk__in=serializer.validated_data["post_ids"]
+        ).values_list("pk", flat=True)
+
+        with transaction.atomic():
+            Like.objects.bulk_create(
+                [
+                    Like(post_id=post_id, profile=user_profile)
+                    for post_id in post_ids
+                ],
+                ignore_conflicts=True,
+                batch_size=BULK_CREATE_BATCH_SIZE,
+            )
+            # bulk_create does not send post_save signals.
+            bump_list_version_on_commit("posts")
+
+        return Response(
+            {"detail": "You have liked these posts."},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="likes",
+        pagination_class=LikeCursorPagination,
+    )
+    def likes(self, request, pk: int) -> Response:
+        """
+        Lists the likes of a post page by page, so posts with many likes
+        never have to be loaded and rendered in one response.
+        """
+        post = get_object_or_404(Post, pk=pk)
+        # The related manager attaches the post to every like, which needs
+        # post_id loaded.
+        queryset = post.likes.select_related("profile").only(
+            "id", "liked_at", "post_id", "profile__username"
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(
         detail=False,
         methods=["get"],
         url_path="liked",
         permission_classes=[IsAuthenticated],
+        pagination_class=PostCursorPagination,
     )
     def liked(self, request) -> Response:
-        user_profile = request.user.profile
-        liked_posts = self.get_queryset().filter(likes__profile=user_profile)
-        serialzer = PostSerializer(liked_posts, many=True)
-        return Response(serialzer.data)
+        # Reuse the liked_by_user EXISTS annotation as a semi-join, which
+        # cannot repeat a post the way a join on likes could.
+        liked_posts = self.get_queryset().filter(liked_by_user=True)
+        return self.cached_response(self.paginated_response, liked_posts)
+
+    def paginated_response(self, queryset: QuerySet[Post]) -> Response:
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 @extend_schema(
@@ -613,16 +824,34 @@ class PostViewSet(viewsets.ModelViewSet):
 class CommentViewSet(viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (IsOwnerOrReadOnly,)
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self) -> QuerySet:
-        queryset = Comment.objects.filter(
-            post_id=self.kwargs["post_pk"]
-        ).prefetch_related("author")
+        queryset = (
+            Comment.objects.filter(post_id=self.kwargs["post_pk"])
+            .select_related("author")
+            .only(
+                "id",
+                "content",
+                "commented_at",
+                "post_id",
+                "author__username",
+            )
+        )
         return queryset
 
     def perform_create(self, serializer: CommentSerializer) -> None:
-        post = get_object_or_404(Post, pk=self.kwargs.get("post_pk"))
-        serializer.save(author=self.request.user.profile, post=post)
+        # An EXISTS instead of loading the post; the deferred foreign key
+        # check would only fail at the outermost commit.
+        post_pk = self.kwargs["post_pk"]
+        if not Post.objects.filter(pk=post_pk).exists():
+            raise NotFound("No Post matches the given query.")
+        serializer.save(author=self.request.user.profile, post_id=post_pk)
+
+    def perform_destroy(self, instance: Comment) -> None:
+        instance.delete()
+        # Comments have no post_delete receiver, so bump the lists here.
+        bump_list_version_on_commit("posts")
 
     def create(self, request, *args, **kwargs) -> Response:
         """
@@ -632,3 +861,40 @@ class CommentViewSet(viewsets.ModelViewSet):
         self.permission_classes = [IsAuthenticated]
         self.check_permissions(request)
         return super().create(request, *args, **kwargs)
+
+    @extend_schema(
+        request=CommentSerializer(many=True),
+        responses={201: CommentSerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk(self, request, post_pk: int = None) -> Response:
+        """
+        Creates several comments under a post in a single INSERT, e.g. when
+        a client flushes the comments it queued while offline.
+        """
+        post = get_object_or_404(Post, pk=post_pk)
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=100
+        )
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            comments = Comment.objects.bulk_create(
+                [
+                    Comment(author=request.user.profile, post=post, **data)
+                    for data in serializer.validated_data
+                ],
+                batch_size=BULK_CREATE_BATCH_SIZE,
+            )
+            # bulk_create does not send post_save signals.
+            bump_list_version_on_commit("posts")
+
+        return Response(
+            self.get_serializer(comments, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
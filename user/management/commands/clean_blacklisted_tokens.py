@@ -1,12 +1,32 @@
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 
 
 class Command(BaseCommand):
-    help = "Clean blacklisted tokens"
+    help = "Clean blacklisted tokens that have already expired"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=0,
+            metavar="DAYS",
+            help="Only clean tokens that expired more than DAYS days ago.",
+        )
 
     def handle(self, *args, **kwargs):
-        BlacklistedToken.objects.all().delete()
+        # A token that has not expired yet must stay blacklisted, or it
+        # would be accepted again. Nothing depends on BlacklistedToken, so
+        # this is a single DELETE without loading the rows.
+        expired_before = timezone.now() - timedelta(days=kwargs["older_than"])
+        deleted, _ = BlacklistedToken.objects.filter(
+            token__expires_at__lt=expired_before
+        ).delete()
         self.stdout.write(
-            self.style.SUCCESS("Successfully cleaned blacklisted tokens")
+            self.style.SUCCESS(
+                f"Successfully cleaned {deleted} blacklisted tokens"
+            )
         )
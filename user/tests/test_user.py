@@ -1,7 +1,16 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.test import APITestCase
 from rest_framework import serializers
@@ -86,7 +95,6 @@ class UserViewsTests(APITestCase):
             email="test@test.com",
             password="testpassword"
         )
-        self.client.force_authenticate(user=self.user)
         self.token = RefreshToken.for_user(self.user)
 
         self.client.credentials(
@@ -110,3 +118,33 @@ class UserViewsTests(APITestCase):
     def test_logout_fail_with_no_token(self):
         response = self.client.post(reverse("user:logout"))
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CleanBlacklistedTokensTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpassword"
+        )
+        self.expired = RefreshToken.for_user(user)
+        self.active = RefreshToken.for_user(user)
+        self.expired.blacklist()
+        self.active.blacklist()
+        OutstandingToken.objects.filter(jti=self.expired["jti"]).update(
+            expires_at=timezone.now() - timedelta(days=2)
+        )
+
+    def test_only_expired_tokens_are_cleaned(self):
+        with self.assertNumQueries(1):
+            call_command("clean_blacklisted_tokens", stdout=StringIO())
+
+        remaining = BlacklistedToken.objects.values_list(
+            "token__jti", flat=True
+        )
+        self.assertEqual(list(remaining), [self.active["jti"]])
+
+    def test_older_than_keeps_recently_expired_tokens(self):
+        call_command(
+            "clean_blacklisted_tokens", "--older-than=3", stdout=StringIO()
+        )
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
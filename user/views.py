@@ -1,6 +1,6 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.views import TokenBlacklistView
 from rest_framework.response import Response
 
@@ -14,7 +14,6 @@ class CreateUserView(generics.CreateAPIView):
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
@@ -22,7 +21,8 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
 
 
 class LogoutView(TokenBlacklistView):
-    authentication_classes = (JWTAuthentication,)
+    # TokenBlacklistView disables authentication; restore the default one.
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
     permission_classes = (IsAuthenticated,)
 
     def post(self, request, *args, **kwargs) -> Response: